@@ -2,13 +2,19 @@
 
 import json
 import logging
+import math
+import random
 import re
-from datetime import datetime
-from typing import Dict, Optional
-from urllib.request import urlopen
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from functools import partial
+from time import sleep, time
+from typing import Callable, Dict, List, Optional, TypeVar
 from zoneinfo import ZoneInfo
 
 import requests
+from requests.exceptions import HTTPError
 
 try:
     from aind_alert_utils.teams import create_body_contents
@@ -33,6 +39,169 @@ from codeocean.data_asset import (
 
 from aind_codeocean_pipeline_monitor.models import PipelineMonitorSettings
 
+T = TypeVar("T")
+
+# Retry settings used when Code Ocean responds with 429 Too Many Requests
+_MAX_ATTEMPTS = 7
+_BACKOFF_MIN = 8
+_BACKOFF_MAX = 32
+_BACKOFF_JITTER = 5
+# Upper bound in seconds on a single sleep, even if Retry-After asks for more
+_RETRY_SLEEP_MAX = 300
+
+# Adaptive polling settings. The interval doubles from _POLL_BASE up to the
+# configured polling interval.
+_POLL_BASE = 2
+_POLL_JITTER = 1
+
+# Timeout in seconds for downloading result files
+_DOWNLOAD_TIMEOUT = 30
+
+_DERIVED_RE = re.compile(DataRegex.DERIVED.value)
+# Format of the datetime suffix in default data asset names
+_DT_SUFFIX_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+
+def _get_retry_after(response: requests.Response) -> Optional[float]:
+    """
+    Parse the Retry-After header of a response. The header can either be a
+    number of seconds or an HTTP-date.
+
+    Parameters
+    ----------
+    response : requests.Response
+
+    Returns
+    -------
+    Optional[float]
+      Seconds to wait before retrying. None if the header is missing or
+      can not be parsed.
+
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    seconds = (retry_at - datetime.now(tz=timezone.utc)).total_seconds()
+    return max(0.0, seconds)
+
+
+def _retry_on_too_many_requests(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Call func and retry it if Code Ocean responds with 429 Too Many Requests.
+    Will sleep for an exponential backoff with jitter, or longer if the
+    Retry-After header requests it. A single sleep is capped at
+    _RETRY_SLEEP_MAX seconds.
+
+    Parameters
+    ----------
+    func : Callable[..., T]
+    args : Any
+      Positional arguments passed to func
+    kwargs : Any
+      Keyword arguments passed to func
+
+    Returns
+    -------
+    T
+      The response from func
+
+    """
+    attempt = 1
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except HTTPError as e:
+            if (
+                e.response is None
+                or e.response.status_code != 429
+                or attempt >= _MAX_ATTEMPTS
+            ):
+                raise e
+            backoff = min(
+                _BACKOFF_MAX, _BACKOFF_MIN * 2 ** (attempt - 1)
+            ) + random.uniform(0, _BACKOFF_JITTER)
+            retry_after = _get_retry_after(e.response) or 0.0
+            wait_time = min(_RETRY_SLEEP_MAX, max(retry_after, backoff))
+            logging.warning(
+                f"Too many requests. Retrying in {wait_time:.1f} seconds."
+            )
+            sleep(wait_time)
+            attempt += 1
+
+
+def _poll_until(
+    get_latest: Callable[[], T],
+    finished_states: List[Enum],
+    polling_interval: float,
+    timeout: Optional[float],
+    timeout_message: str,
+) -> T:
+    """
+    Poll a resource until it reaches a finished state. The time between
+    polls starts at _POLL_BASE seconds and doubles after each poll, up to
+    polling_interval, plus some jitter. It resets to _POLL_BASE whenever the
+    state of the resource changes. Each poll is retried separately if Code
+    Ocean responds with a 429 status code, so a rate limited poll does not
+    reset the timeout clock.
+
+    Parameters
+    ----------
+    get_latest : Callable[[], T]
+      Fetches the current state of the resource
+    finished_states : List[Enum]
+      Polling stops once the state of the resource is in this list
+    polling_interval : float
+      Maximum time in seconds in between polls. Must be at least 5.
+    timeout : Optional[float]
+      Time in seconds before a TimeoutError is raised. Must be at least the
+      polling_interval. Set to None to wait indefinitely.
+    timeout_message : str
+      Message of the TimeoutError
+
+    Returns
+    -------
+    T
+      The resource in a finished state
+
+    """
+    if polling_interval < 5:
+        raise ValueError(
+            f"Polling interval {polling_interval} should be greater than or "
+            f"equal to 5"
+        )
+    if timeout is not None and timeout < polling_interval:
+        raise ValueError(
+            f"Timeout {timeout} should be greater than or equal to polling "
+            f"interval {polling_interval}"
+        )
+    attempt = 0
+    last_state = None
+    t0 = time()
+    while True:
+        latest = _retry_on_too_many_requests(get_latest)
+        if latest.state in finished_states:
+            return latest
+        if timeout is not None and (time() - t0) > timeout:
+            raise TimeoutError(timeout_message)
+        if latest.state != last_state:
+            attempt = 0
+            last_state = latest.state
+        interval = min(polling_interval, _POLL_BASE * 2**attempt)
+        sleep(interval + random.uniform(0, _POLL_JITTER))
+        attempt += 1
+
 
 class PipelineMonitorJob:
     """Class to run a PipelineMonitor Job"""
@@ -43,10 +212,15 @@ class PipelineMonitorJob:
         """Class constructor"""
         self.job_settings = job_settings
         self.client = client
+        # Responses that do not change during a job are cached to save
+        # requests against the rate limit
+        self._input_data_name: Optional[str] = None
+        self._data_description_info: Dict[str, Dict[str, Optional[str]]] = {}
 
     def _monitor_pipeline(self, computation: Computation) -> Computation:
         """
-        Monitor a pipeline. Will retry requests if TooManyRequests.
+        Monitor a pipeline. Will retry requests if Code Ocean responds with
+        a 429 status code.
         Parameters
         ----------
         computation : Computation
@@ -58,14 +232,23 @@ class PipelineMonitorJob:
 
         """
         try:
-            wait_until_completed_response = (
-                self.client.computations.wait_until_completed(
-                    computation=computation,
-                    polling_interval=(
-                        self.job_settings.computation_polling_interval
-                    ),
-                    timeout=self.job_settings.computation_timeout,
-                )
+            timeout = self.job_settings.computation_timeout
+            wait_until_completed_response = _poll_until(
+                get_latest=partial(
+                    self.client.computations.get_computation, computation.id
+                ),
+                finished_states=[
+                    ComputationState.Completed,
+                    ComputationState.Failed,
+                ],
+                polling_interval=(
+                    self.job_settings.computation_polling_interval
+                ),
+                timeout=timeout,
+                timeout_message=(
+                    f"Computation {computation.id} did not complete within "
+                    f"{timeout} seconds"
+                ),
             )
             if wait_until_completed_response.state == ComputationState.Failed:
                 raise Exception(
@@ -84,7 +267,8 @@ class PipelineMonitorJob:
 
     def _wait_for_data_asset(self, create_data_asset_response) -> DataAsset:
         """
-        Wait for data asset to be available. Will retry if TooManyRequests.
+        Wait for data asset to be available. Will retry requests if Code
+        Ocean responds with a 429 status code.
         Parameters
         ----------
         create_data_asset_response : DataAsset
@@ -93,12 +277,21 @@ class PipelineMonitorJob:
         -------
 
         """
-        wait_until_ready_response = self.client.data_assets.wait_until_ready(
-            data_asset=create_data_asset_response,
+        data_asset_id = create_data_asset_response.id
+        timeout = self.job_settings.data_asset_ready_timeout
+        wait_until_ready_response = _poll_until(
+            get_latest=partial(
+                self.client.data_assets.get_data_asset, data_asset_id
+            ),
+            finished_states=[DataAssetState.Ready, DataAssetState.Failed],
             polling_interval=(
                 self.job_settings.data_asset_ready_polling_interval
             ),
-            timeout=self.job_settings.data_asset_ready_timeout,
+            timeout=timeout,
+            timeout_message=(
+                f"Data asset {data_asset_id} was not ready within "
+                f"{timeout} seconds"
+            ),
         )
         if wait_until_ready_response.state == DataAssetState.Failed:
             raise Exception(
@@ -133,24 +326,26 @@ class PipelineMonitorJob:
             )
 
     def _get_input_data_name(self) -> Optional[str]:
-        """Get the name of the input data asset from the run_params"""
+        """Get the name of the input data asset from the run_params. The
+        name is only requested from Code Ocean once per job."""
 
         input_data_assets = self.job_settings.run_params.data_assets
-        if input_data_assets:
+        if input_data_assets and self._input_data_name is None:
             first_data_asset = input_data_assets[0]
-            input_data_asset = self.client.data_assets.get_data_asset(
-                data_asset_id=first_data_asset.id
+            input_data_asset = _retry_on_too_many_requests(
+                self.client.data_assets.get_data_asset,
+                data_asset_id=first_data_asset.id,
             )
-            return input_data_asset.name
-        else:
-            return None
+            self._input_data_name = input_data_asset.name
+        return self._input_data_name
 
     def _get_name_and_level_from_data_description(
         self, computation: Computation
     ) -> Dict[str, Optional[str]]:
         """
         Attempts to download a data_description file from the 'results' folder
-        and then extracts the 'name' and 'data_level' from that file.
+        and then extracts the 'name' and 'data_level' from that file. The
+        result is cached per computation id.
 
         Parameters
         ----------
@@ -163,30 +358,42 @@ class PipelineMonitorJob:
 
         """
 
+        if computation.id in self._data_description_info:
+            return dict(self._data_description_info[computation.id])
+
         dd_file_name = (
             self.job_settings.capture_settings.data_description_file_name
         )
 
-        result_files = self.client.computations.list_computation_results(
-            computation_id=computation.id
-        )
-
-        if dd_file_name in [r.path for r in result_files.items]:
-            download_url = (
-                self.client.computations.get_result_file_download_url(
-                    computation_id=computation.id,
-                    path=dd_file_name,
-                )
+        # Request the download url directly instead of listing the results
+        # first. Code Ocean responds with a 404 if the file does not exist.
+        try:
+            download_url = _retry_on_too_many_requests(
+                self.client.computations.get_result_file_download_url,
+                computation_id=computation.id,
+                path=dd_file_name,
             )
-            with urlopen(download_url.url) as f:
-                contents = f.read().decode("utf-8")
-            data_description = json.loads(contents)
-            return {
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise e
+            download_url = None
+
+        if download_url is not None:
+            # The download url is presigned, so it is requested without the
+            # Code Ocean client's session and credentials
+            response = requests.get(
+                download_url.url, timeout=_DOWNLOAD_TIMEOUT
+            )
+            response.raise_for_status()
+            data_description = json.loads(response.content)
+            info = {
                 "name": data_description.get("name"),
                 "data_level": data_description.get("data_level"),
             }
         else:
-            return {"name": None, "data_level": None}
+            info = {"name": None, "data_level": None}
+        self._data_description_info[computation.id] = info
+        return dict(info)
 
     def _get_name(
         self, computation: Computation, input_data_name: Optional[str]
@@ -214,17 +421,6 @@ class PipelineMonitorJob:
 
         """
 
-        capture_params = self.job_settings.capture_settings
-        dt = datetime.now(
-            tz=ZoneInfo(
-                self.job_settings.capture_settings.process_name_suffix_tz
-            )
-        )
-        suffix = capture_params.process_name_suffix
-        dt_suffix = dt.strftime("%Y-%m-%d_%H-%M-%S")
-
-        default_name = f"{input_data_name}_{suffix}_{dt_suffix}"
-
         info_from_file = self._get_name_and_level_from_data_description(
             computation=computation
         )
@@ -239,7 +435,7 @@ class PipelineMonitorJob:
             name_from_file = None
         elif (
             name_from_file is not None
-            and re.match(DataRegex.DERIVED.value, name_from_file) is None
+            and _DERIVED_RE.match(name_from_file) is None
         ):
             logging.warning(
                 f"Name in data description {name_from_file} "
@@ -248,12 +444,17 @@ class PipelineMonitorJob:
             )
             name_from_file = None
 
-        if name_from_file is None and input_data_name is None:
-            raise Exception("Unable to construct data asset name.")
-        elif name_from_file is not None:
+        if name_from_file is not None:
             return name_from_file
-        else:
-            return default_name
+        elif input_data_name is None:
+            raise Exception("Unable to construct data asset name.")
+
+        # Only build the default name if the data description can't be used
+        capture_params = self.job_settings.capture_settings
+        dt = datetime.now(tz=ZoneInfo(capture_params.process_name_suffix_tz))
+        suffix = capture_params.process_name_suffix
+        dt_suffix = dt.strftime(_DT_SUFFIX_FORMAT)
+        return f"{input_data_name}_{suffix}_{dt_suffix}"
 
     def _build_data_asset_params(
         self,
@@ -276,39 +477,38 @@ class PipelineMonitorJob:
         DataAssetParams
 
         """
-        if self.job_settings.capture_settings.name is not None:
-            data_asset_name = self.job_settings.capture_settings.name
+        capture_settings = self.job_settings.capture_settings
+        if capture_settings.name is not None:
+            data_asset_name = capture_settings.name
         else:
             data_asset_name = self._get_name(
                 computation=monitor_pipeline_response,
                 input_data_name=input_data_name,
             )
-        if self.job_settings.capture_settings.mount is not None:
-            data_asset_mount = self.job_settings.capture_settings.mount
+        if capture_settings.mount is not None:
+            data_asset_mount = capture_settings.mount
         else:
             data_asset_mount = data_asset_name
-        if self.job_settings.capture_settings.target is not None:
+        if capture_settings.target is not None:
             prefix = data_asset_name
-            bucket = self.job_settings.capture_settings.target.aws.bucket
+            bucket = capture_settings.target.aws.bucket
             target = Target(aws=AWSS3Target(bucket=bucket, prefix=prefix))
         else:
             target = None
 
         data_asset_params = DataAssetParams(
             name=data_asset_name,
-            description=self.job_settings.capture_settings.description,
+            description=capture_settings.description,
             mount=data_asset_mount,
-            tags=self.job_settings.capture_settings.tags,
+            tags=capture_settings.tags,
             source=Source(
                 computation=ComputationSource(
                     id=monitor_pipeline_response.id,
                 ),
             ),
             target=target,
-            custom_metadata=(
-                self.job_settings.capture_settings.custom_metadata
-            ),
-            results_info=self.job_settings.capture_settings.results_info,
+            custom_metadata=capture_settings.custom_metadata,
+            results_info=capture_settings.results_info,
         )
         return data_asset_params
 
@@ -344,10 +544,11 @@ class PipelineMonitorJob:
                     monitor_pipeline_response=monitor_pipeline_response,
                     input_data_name=input_data_name,
                 )
-                capture_result_response = (
-                    self.client.data_assets.create_data_asset(
-                        data_asset_params=data_asset_params
-                    )
+                # A 429 response means the asset was not created, so it is
+                # safe to retry without creating a duplicate asset
+                capture_result_response = _retry_on_too_many_requests(
+                    self.client.data_assets.create_data_asset,
+                    data_asset_params=data_asset_params,
                 )
                 logging.info(
                     f"capture_result_response: {capture_result_response}"
@@ -358,7 +559,8 @@ class PipelineMonitorJob:
                 logging.info(
                     f"wait_for_data_asset_response: {wait_for_data_asset}"
                 )
-                self.client.data_assets.update_permissions(
+                _retry_on_too_many_requests(
+                    self.client.data_assets.update_permissions,
                     data_asset_id=capture_result_response.id,
                     permissions=self.job_settings.capture_settings.permissions,
                 )
@@ -69,7 +69,9 @@ class PipelineMonitorSettings(BaseSettings):
     computation_polling_interval: float = Field(
         default=180,
         description=(
-            "Time in seconds in between checks that the pipeline is finished."
+            "Maximum time in seconds in between checks that the pipeline is "
+            "finished. Checks start more often and back off to this interval, "
+            "starting over whenever the pipeline state changes."
         ),
         gte=5,
     )
@@ -84,8 +86,9 @@ class PipelineMonitorSettings(BaseSettings):
     data_asset_ready_polling_interval: float = Field(
         default=10,
         description=(
-            "Time in seconds in between checks that the captured data asset "
-            "is ready."
+            "Maximum time in seconds in between checks that the captured data "
+            "asset is ready. Checks start more often and back off to this "
+            "interval, starting over whenever the data asset state changes."
         ),
         gte=5,
     )
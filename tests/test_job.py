@@ -3,8 +3,9 @@
 import json
 import os
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 from unittest.mock import MagicMock, call, patch
 
 from codeocean import CodeOcean
@@ -14,7 +15,6 @@ from codeocean.computation import (
     ComputationState,
     DataAssetsRunParam,
     DownloadFileURL,
-    Folder,
     RunParams,
 )
 from codeocean.data_asset import (
@@ -27,11 +27,15 @@ from codeocean.data_asset import (
     Source,
     Target,
 )
-from codeocean.folder import FolderItem
 from requests import Response
 from requests.exceptions import HTTPError
 
-from aind_codeocean_pipeline_monitor.job import PipelineMonitorJob
+from aind_codeocean_pipeline_monitor.job import (
+    PipelineMonitorJob,
+    _get_retry_after,
+    _poll_until,
+    _retry_on_too_many_requests,
+)
 from aind_codeocean_pipeline_monitor.models import (
     CaptureSettings,
     PipelineMonitorSettings,
@@ -79,6 +83,17 @@ class TestPipelineMonitorJob(unittest.TestCase):
         internal_server_error = HTTPError()
         internal_server_error.response = internal_server_error_response
 
+        not_found_response = Response()
+        not_found_response.status_code = 404
+        not_found_error = HTTPError()
+        not_found_error.response = not_found_response
+
+        too_many_requests_response = Response()
+        too_many_requests_response.status_code = 429
+        too_many_requests_response.headers["Retry-After"] = "60"
+        too_many_requests_error = HTTPError()
+        too_many_requests_error.response = too_many_requests_response
+
         co_client = CodeOcean(domain="test_domain", token="token")
         no_capture_job = PipelineMonitorJob(
             job_settings=no_capture_result_settings, client=co_client
@@ -93,16 +108,21 @@ class TestPipelineMonitorJob(unittest.TestCase):
         cls.capture_job = capture_job
         cls.capture_job_with_alert = capture_job_with_alert
         cls.internal_server_error = internal_server_error
+        cls.too_many_requests_error = too_many_requests_error
+        cls.not_found_error = not_found_error
         cls.expected_data_description = expected_data_description
 
     @patch("codeocean.computation.Computations.get_computation")
-    @patch("codeocean.computation.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
     def test_monitor_pipeline(
         self,
+        mock_uniform: MagicMock,
         mock_sleep: MagicMock,
         mock_get_computation: MagicMock,
     ):
         """Tests _monitor_pipeline method with successful completion"""
+        mock_uniform.return_value = 0.5
         completed_comp = Computation(
             id="c123",
             created=0,
@@ -130,10 +150,10 @@ class TestPipelineMonitorJob(unittest.TestCase):
             )
         )
         self.assertEqual(completed_comp, response)
-        mock_sleep.assert_called_once_with(180)
+        mock_sleep.assert_called_once_with(2.5)
 
     @patch("codeocean.computation.Computations.get_computation")
-    @patch("codeocean.computation.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
     def test_monitor_pipeline_error(
         self,
         mock_sleep: MagicMock,
@@ -153,9 +173,45 @@ class TestPipelineMonitorJob(unittest.TestCase):
             )
         mock_sleep.assert_not_called()
 
+    @patch("codeocean.computation.Computations.get_computation")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_monitor_pipeline_too_many_requests(
+        self,
+        mock_sleep: MagicMock,
+        mock_get_computation: MagicMock,
+    ):
+        """Tests _monitor_pipeline method retries if too many requests"""
+        completed_comp = Computation(
+            id="c123",
+            created=0,
+            name="c_name",
+            state=ComputationState.Completed,
+            run_time=100,
+        )
+        mock_get_computation.side_effect = [
+            self.too_many_requests_error,
+            completed_comp,
+        ]
+        with self.assertLogs(level="WARNING") as captured:
+            response = self.no_capture_job._monitor_pipeline(
+                computation=Computation(
+                    id="c123",
+                    created=0,
+                    name="c_name",
+                    state=ComputationState.Initializing,
+                    run_time=0,
+                )
+            )
+        self.assertEqual(completed_comp, response)
+        self.assertEqual(
+            ["WARNING:root:Too many requests. Retrying in 60.0 seconds."],
+            captured.output,
+        )
+        mock_sleep.assert_called_once_with(60.0)
+
     @patch("codeocean.computation.Computations.delete_computation")
     @patch("codeocean.computation.Computations.get_computation")
-    @patch("codeocean.computation.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
     def test_monitor_pipeline_timeout_error(
         self,
         mock_sleep: MagicMock,
@@ -186,13 +242,16 @@ class TestPipelineMonitorJob(unittest.TestCase):
         self.assertEqual(expected_logs, captured.output)
 
     @patch("codeocean.computation.Computations.get_computation")
-    @patch("codeocean.computation.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
     def test_monitor_pipeline_failed(
         self,
+        mock_uniform: MagicMock,
         mock_sleep: MagicMock,
         mock_get_computation: MagicMock,
     ):
         """Tests _monitor_pipeline method with failed completion"""
+        mock_uniform.return_value = 0.5
         failed_comp = Computation(
             id="c123",
             created=0,
@@ -221,16 +280,19 @@ class TestPipelineMonitorJob(unittest.TestCase):
                 )
             )
         self.assertIn("The pipeline run failed", e.exception.args[0])
-        mock_sleep.assert_called_once_with(180)
+        mock_sleep.assert_called_once_with(2.5)
 
     @patch("codeocean.data_asset.DataAssets.get_data_asset")
-    @patch("codeocean.data_asset.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
     def test_wait_for_data_asset(
         self,
+        mock_uniform: MagicMock,
         mock_sleep: MagicMock,
         mock_get_data_asset: MagicMock,
     ):
         """Tests wait for Data asset success."""
+        mock_uniform.return_value = 0.5
         initial_data_asset = DataAsset(
             id="def-123",
             created=1,
@@ -257,10 +319,10 @@ class TestPipelineMonitorJob(unittest.TestCase):
         response = self.capture_job._wait_for_data_asset(initial_data_asset)
 
         self.assertEqual(completed_data_asset, response)
-        mock_sleep.assert_called_once_with(10)
+        mock_sleep.assert_called_once_with(2.5)
 
     @patch("codeocean.data_asset.DataAssets.get_data_asset")
-    @patch("codeocean.data_asset.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
     def test_wait_for_data_asset_error(
         self,
         mock_sleep: MagicMock,
@@ -282,13 +344,53 @@ class TestPipelineMonitorJob(unittest.TestCase):
         mock_sleep.assert_not_called()
 
     @patch("codeocean.data_asset.DataAssets.get_data_asset")
-    @patch("codeocean.data_asset.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_wait_for_data_asset_too_many_requests(
+        self,
+        mock_sleep: MagicMock,
+        mock_get_data_asset: MagicMock,
+    ):
+        """Tests _wait_for_data_asset method retries if too many requests"""
+        initial_data_asset = DataAsset(
+            id="def-123",
+            created=1,
+            name="da_name",
+            mount="da_mount",
+            state=DataAssetState.Draft,
+            type=DataAssetType.Result,
+            last_used=1,
+        )
+        completed_data_asset = DataAsset(
+            id="def-123",
+            created=1,
+            name="da_name",
+            mount="da_mount",
+            state=DataAssetState.Ready,
+            type=DataAssetType.Result,
+            last_used=1,
+        )
+        mock_get_data_asset.side_effect = [
+            self.too_many_requests_error,
+            completed_data_asset,
+        ]
+        with self.assertLogs(level="WARNING"):
+            response = self.capture_job._wait_for_data_asset(
+                initial_data_asset
+            )
+        self.assertEqual(completed_data_asset, response)
+        mock_sleep.assert_called_once_with(60.0)
+
+    @patch("codeocean.data_asset.DataAssets.get_data_asset")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
     def test_wait_for_data_asset_failed(
         self,
+        mock_uniform: MagicMock,
         mock_sleep: MagicMock,
         mock_get_data_asset: MagicMock,
     ):
         """Tests _monitor_pipeline method with failed completion"""
+        mock_uniform.return_value = 0.5
         initial_data_asset = DataAsset(
             id="def-123",
             created=1,
@@ -314,7 +416,7 @@ class TestPipelineMonitorJob(unittest.TestCase):
         with self.assertRaises(Exception) as e:
             self.capture_job._wait_for_data_asset(initial_data_asset)
         self.assertIn("Data asset creation failed", e.exception.args[0])
-        mock_sleep.assert_called_once_with(10)
+        mock_sleep.assert_called_once_with(2.5)
 
     @patch("requests.post")
     def test_send_alert_to_teams(self, mock_post: MagicMock):
@@ -365,8 +467,42 @@ class TestPipelineMonitorJob(unittest.TestCase):
             type=DataAssetType.Dataset,
             last_used=1,
         )
-        input_data_name = self.capture_job._get_input_data_name()
+        job = PipelineMonitorJob(
+            job_settings=self.capture_job.job_settings,
+            client=self.capture_job.client,
+        )
+        input_data_name = job._get_input_data_name()
+        self.assertEqual("ecephys_123456_2020-10-10_00-00-00", input_data_name)
+        # Second call uses the cached name
+        self.assertEqual(input_data_name, job._get_input_data_name())
+        mock_get_data_asset.assert_called_once()
+
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch("codeocean.data_asset.DataAssets.get_data_asset")
+    def test_get_input_data_name_too_many_requests(
+        self, mock_get_data_asset: MagicMock, mock_sleep: MagicMock
+    ):
+        """Tests _get_input_data_name retries if too many requests"""
+        mock_get_data_asset.side_effect = [
+            self.too_many_requests_error,
+            DataAsset(
+                id="abc-001",
+                created=0,
+                name="ecephys_123456_2020-10-10_00-00-00",
+                mount="ecephys",
+                state=DataAssetState.Ready,
+                type=DataAssetType.Dataset,
+                last_used=1,
+            ),
+        ]
+        job = PipelineMonitorJob(
+            job_settings=self.capture_job.job_settings,
+            client=self.capture_job.client,
+        )
+        with self.assertLogs(level="WARNING"):
+            input_data_name = job._get_input_data_name()
         self.assertEqual("ecephys_123456_2020-10-10_00-00-00", input_data_name)
+        mock_sleep.assert_called_once_with(60.0)
 
     @patch("codeocean.data_asset.DataAssets.get_data_asset")
     def test_get_input_data_name_none(self, mock_get_data_asset: MagicMock):
@@ -375,42 +511,34 @@ class TestPipelineMonitorJob(unittest.TestCase):
         self.assertIsNone(input_data_name)
         mock_get_data_asset.assert_not_called()
 
-    @patch("codeocean.computation.Computations.list_computation_results")
     @patch("codeocean.computation.Computations.get_result_file_download_url")
-    @patch("aind_codeocean_pipeline_monitor.job.urlopen")
+    @patch("requests.get")
     def test_get_name_from_data_description(
         self,
-        mock_url_open: MagicMock,
+        mock_get: MagicMock,
         mock_get_result_file_url: MagicMock,
-        mock_list_comp_results: MagicMock,
     ):
         """Tests _get_name_from_data_description"""
-        mock_list_comp_results.return_value = Folder(
-            items=[
-                FolderItem(name="output", path="output", type=""),
-                FolderItem(
-                    name="data_description.json",
-                    path="data_description.json",
-                    type="",
-                ),
-            ]
-        )
         mock_get_result_file_url.return_value = DownloadFileURL(
             url="some_download_url"
         )
-        mock_read = MagicMock()
-        mock_read.read.return_value = self.expected_data_description.encode(
-            "utf-8"
+        mock_response = Response()
+        mock_response.status_code = 200
+        mock_response._content = self.expected_data_description.encode("utf-8")
+        mock_get.return_value = mock_response
+        job = PipelineMonitorJob(
+            job_settings=self.capture_job.job_settings,
+            client=self.capture_job.client,
         )
-        mock_url_open.return_value.__enter__.return_value = mock_read
-        info = self.capture_job._get_name_and_level_from_data_description(
-            computation=Computation(
-                id="c123",
-                created=0,
-                name="c_name",
-                state=ComputationState.Completed,
-                run_time=100,
-            )
+        computation = Computation(
+            id="c123",
+            created=0,
+            name="c_name",
+            state=ComputationState.Completed,
+            run_time=100,
+        )
+        info = job._get_name_and_level_from_data_description(
+            computation=computation
         )
         expected_info_from_file = {
             "data_level": "derived",
@@ -419,23 +547,32 @@ class TestPipelineMonitorJob(unittest.TestCase):
             ),
         }
         self.assertEqual(expected_info_from_file, info)
+        # Second call uses the cached info
+        self.assertEqual(
+            expected_info_from_file,
+            job._get_name_and_level_from_data_description(
+                computation=computation
+            ),
+        )
+        mock_get_result_file_url.assert_called_once_with(
+            computation_id="c123", path="data_description.json"
+        )
+        mock_get.assert_called_once_with("some_download_url", timeout=30)
 
-    @patch("codeocean.computation.Computations.list_computation_results")
     @patch("codeocean.computation.Computations.get_result_file_download_url")
-    @patch("aind_codeocean_pipeline_monitor.job.urlopen")
+    @patch("requests.get")
     def test_get_name_from_data_description_none(
         self,
-        mock_url_open: MagicMock,
+        mock_get: MagicMock,
         mock_get_result_file_url: MagicMock,
-        mock_list_comp_results: MagicMock,
     ):
         """Tests _get_name_from_data_description when no file is found."""
-        mock_list_comp_results.return_value = Folder(
-            items=[
-                FolderItem(name="output", path="output", type=""),
-            ]
+        mock_get_result_file_url.side_effect = self.not_found_error
+        job = PipelineMonitorJob(
+            job_settings=self.capture_job.job_settings,
+            client=self.capture_job.client,
         )
-        info = self.capture_job._get_name_and_level_from_data_description(
+        info = job._get_name_and_level_from_data_description(
             computation=Computation(
                 id="c123",
                 created=0,
@@ -446,8 +583,32 @@ class TestPipelineMonitorJob(unittest.TestCase):
         )
         expected_info = {"name": None, "data_level": None}
         self.assertEqual(expected_info, info)
-        mock_url_open.assert_not_called()
-        mock_get_result_file_url.assert_not_called()
+        mock_get.assert_not_called()
+
+    @patch("codeocean.computation.Computations.get_result_file_download_url")
+    @patch("requests.get")
+    def test_get_name_from_data_description_error(
+        self,
+        mock_get: MagicMock,
+        mock_get_result_file_url: MagicMock,
+    ):
+        """Tests _get_name_from_data_description when request fails."""
+        mock_get_result_file_url.side_effect = self.internal_server_error
+        job = PipelineMonitorJob(
+            job_settings=self.capture_job.job_settings,
+            client=self.capture_job.client,
+        )
+        with self.assertRaises(HTTPError):
+            job._get_name_and_level_from_data_description(
+                computation=Computation(
+                    id="c123",
+                    created=0,
+                    name="c_name",
+                    state=ComputationState.Completed,
+                    run_time=100,
+                )
+            )
+        mock_get.assert_not_called()
 
     @patch("aind_codeocean_pipeline_monitor.job.datetime")
     @patch(
@@ -539,6 +700,7 @@ class TestPipelineMonitorJob(unittest.TestCase):
             name,
         )
         mock_get_input_data_name.assert_not_called()
+        mock_dt.now.assert_not_called()
 
     @patch("aind_codeocean_pipeline_monitor.job.datetime")
     @patch(
@@ -848,6 +1010,133 @@ class TestPipelineMonitorJob(unittest.TestCase):
         )
         mock_send_alert.assert_not_called()
 
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._get_input_data_name"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._build_data_asset_params"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._wait_for_data_asset"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._monitor_pipeline"
+    )
+    @patch("codeocean.data_asset.DataAssets.create_data_asset")
+    @patch("codeocean.computation.Computations.run_capsule")
+    @patch("codeocean.data_asset.DataAssets.update_permissions")
+    def test_run_job_create_data_asset_too_many_requests(
+        self,
+        mock_update_permissions: MagicMock,
+        mock_run_capsule: MagicMock,
+        mock_create_data_asset: MagicMock,
+        mock_monitor_pipeline: MagicMock,
+        mock_wait_for_data_asset: MagicMock,
+        mock_build_data_asset_params: MagicMock,
+        mock_get_input_data_name: MagicMock,
+        mock_sleep: MagicMock,
+    ):
+        """Tests create_data_asset is retried if too many requests"""
+        mock_get_input_data_name.return_value = "ecephys_123456"
+        mock_monitor_pipeline.return_value = Computation(
+            id="c123",
+            created=0,
+            name="c_name",
+            state=ComputationState.Completed,
+            run_time=100,
+        )
+        created_data_asset = DataAsset(
+            id="def-123",
+            created=1,
+            name="ecephys_123456_processed",
+            mount="ecephys_123456_processed",
+            state=DataAssetState.Draft,
+            type=DataAssetType.Result,
+            last_used=1,
+        )
+        mock_create_data_asset.side_effect = [
+            self.too_many_requests_error,
+            created_data_asset,
+        ]
+        with self.assertLogs(level="INFO"):
+            self.capture_job.run_job()
+
+        self.assertEqual(2, mock_create_data_asset.call_count)
+        mock_sleep.assert_called_once_with(60.0)
+        mock_wait_for_data_asset.assert_called_once_with(
+            create_data_asset_response=created_data_asset
+        )
+        mock_update_permissions.assert_called_once_with(
+            data_asset_id="def-123",
+            permissions=Permissions(everyone=EveryoneRole.Viewer),
+        )
+
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._get_input_data_name"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._build_data_asset_params"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._wait_for_data_asset"
+    )
+    @patch(
+        "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
+        "._monitor_pipeline"
+    )
+    @patch("codeocean.data_asset.DataAssets.create_data_asset")
+    @patch("codeocean.computation.Computations.run_capsule")
+    @patch("codeocean.data_asset.DataAssets.update_permissions")
+    def test_run_job_update_permissions_too_many_requests(
+        self,
+        mock_update_permissions: MagicMock,
+        mock_run_capsule: MagicMock,
+        mock_create_data_asset: MagicMock,
+        mock_monitor_pipeline: MagicMock,
+        mock_wait_for_data_asset: MagicMock,
+        mock_build_data_asset_params: MagicMock,
+        mock_get_input_data_name: MagicMock,
+        mock_sleep: MagicMock,
+    ):
+        """Tests update_permissions is retried if too many requests"""
+        mock_get_input_data_name.return_value = "ecephys_123456"
+        mock_monitor_pipeline.return_value = Computation(
+            id="c123",
+            created=0,
+            name="c_name",
+            state=ComputationState.Completed,
+            run_time=100,
+        )
+        mock_create_data_asset.return_value = DataAsset(
+            id="def-123",
+            created=1,
+            name="ecephys_123456_processed",
+            mount="ecephys_123456_processed",
+            state=DataAssetState.Draft,
+            type=DataAssetType.Result,
+            last_used=1,
+        )
+        mock_update_permissions.side_effect = [
+            self.too_many_requests_error,
+            None,
+        ]
+        with self.assertLogs(level="INFO") as captured:
+            self.capture_job.run_job()
+
+        mock_wait_for_data_asset.assert_called_once()
+        self.assertEqual(2, mock_update_permissions.call_count)
+        mock_sleep.assert_called_once_with(60.0)
+        self.assertIn("INFO:root:Finished job.", captured.output)
+
     @patch(
         "aind_codeocean_pipeline_monitor.job.PipelineMonitorJob"
         "._send_alert_to_teams"
@@ -1045,5 +1334,225 @@ class TestPipelineMonitorJob(unittest.TestCase):
         mock_update_permissions.assert_not_called()
 
 
+class TestRetryOnTooManyRequests(unittest.TestCase):
+    """Test methods to retry requests if Code Ocean returns a 429"""
+
+    @staticmethod
+    def _create_error(
+        status_code: int, retry_after: Optional[str] = None
+    ) -> HTTPError:
+        """Create an HTTPError with a response"""
+        response = Response()
+        response.status_code = status_code
+        if retry_after is not None:
+            response.headers["Retry-After"] = retry_after
+        error = HTTPError()
+        error.response = response
+        return error
+
+    def test_get_retry_after_seconds(self):
+        """Tests Retry-After header is parsed when it is seconds"""
+        error = self._create_error(status_code=429, retry_after="5")
+        self.assertEqual(5.0, _get_retry_after(error.response))
+
+    def test_get_retry_after_not_finite(self):
+        """Tests None is returned if Retry-After header is not finite"""
+        error = self._create_error(status_code=429, retry_after="inf")
+        self.assertIsNone(_get_retry_after(error.response))
+
+    def test_get_retry_after_missing(self):
+        """Tests None is returned if Retry-After header is not set"""
+        error = self._create_error(status_code=429)
+        self.assertIsNone(_get_retry_after(error.response))
+
+    def test_get_retry_after_invalid(self):
+        """Tests None is returned if Retry-After header can't be parsed"""
+        error = self._create_error(status_code=429, retry_after="soon")
+        self.assertIsNone(_get_retry_after(error.response))
+
+    @patch("aind_codeocean_pipeline_monitor.job.datetime")
+    def test_get_retry_after_http_date(self, mock_dt: MagicMock):
+        """Tests Retry-After header is parsed when it is an HTTP-date"""
+        mock_dt.now.return_value = datetime(
+            2020, 11, 10, 0, 0, 0, tzinfo=timezone.utc
+        )
+        error = self._create_error(
+            status_code=429, retry_after="Tue, 10 Nov 2020 00:00:30 GMT"
+        )
+        self.assertEqual(30.0, _get_retry_after(error.response))
+        error = self._create_error(
+            status_code=429, retry_after="Tue, 10 Nov 2020 00:00:30 -0000"
+        )
+        self.assertEqual(30.0, _get_retry_after(error.response))
+        error = self._create_error(
+            status_code=429, retry_after="Mon, 09 Nov 2020 00:00:00 GMT"
+        )
+        self.assertEqual(0.0, _get_retry_after(error.response))
+
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_retry_on_too_many_requests_backoff(
+        self, mock_sleep: MagicMock, mock_uniform: MagicMock
+    ):
+        """Tests exponential backoff is used if Retry-After is not set and
+        error is raised after max attempts"""
+        mock_uniform.return_value = 1
+        error = self._create_error(status_code=429)
+        mock_func = MagicMock(side_effect=error)
+        with self.assertLogs(level="WARNING"):
+            with self.assertRaises(HTTPError):
+                _retry_on_too_many_requests(mock_func, "a", b="c")
+        self.assertEqual(7, mock_func.call_count)
+        mock_func.assert_called_with("a", b="c")
+        mock_sleep.assert_has_calls(
+            [call(9), call(17), call(33), call(33), call(33), call(33)]
+        )
+
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_retry_on_too_many_requests_retry_after(
+        self, mock_sleep: MagicMock, mock_uniform: MagicMock
+    ):
+        """Tests Retry-After is used as a lower bound on the backoff and is
+        capped"""
+        mock_uniform.return_value = 1
+        mock_func = MagicMock(
+            side_effect=[
+                self._create_error(status_code=429, retry_after="0"),
+                self._create_error(status_code=429, retry_after="100"),
+                self._create_error(status_code=429, retry_after="86400"),
+                "ok",
+            ]
+        )
+        with self.assertLogs(level="WARNING") as captured:
+            response = _retry_on_too_many_requests(mock_func)
+        self.assertEqual("ok", response)
+        mock_sleep.assert_has_calls([call(9), call(100.0), call(300)])
+        self.assertEqual(
+            [
+                "WARNING:root:Too many requests. Retrying in 9.0 seconds.",
+                "WARNING:root:Too many requests. Retrying in 100.0 seconds.",
+                "WARNING:root:Too many requests. Retrying in 300.0 seconds.",
+            ],
+            captured.output,
+        )
+
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_retry_on_too_many_requests_other_error(
+        self, mock_sleep: MagicMock
+    ):
+        """Tests other errors are raised without retrying"""
+        mock_func = MagicMock(side_effect=[self._create_error(500), "ok"])
+        with self.assertRaises(HTTPError):
+            _retry_on_too_many_requests(mock_func)
+        mock_func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
+class TestPollUntil(unittest.TestCase):
+    """Test _poll_until method"""
+
+    @staticmethod
+    def _computation(state: ComputationState) -> Computation:
+        """Create a computation in a given state"""
+        return Computation(
+            id="c123", created=0, name="c_name", state=state, run_time=1
+        )
+
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_poll_until_backoff(
+        self, mock_sleep: MagicMock, mock_uniform: MagicMock
+    ):
+        """Tests poll interval doubles up to the polling_interval and resets
+        when the state changes"""
+        mock_uniform.return_value = 0.5
+        initializing = self._computation(ComputationState.Initializing)
+        running = self._computation(ComputationState.Running)
+        completed = self._computation(ComputationState.Completed)
+        get_latest = MagicMock(
+            side_effect=[initializing] * 3 + [running] * 9 + [completed]
+        )
+        response = _poll_until(
+            get_latest=get_latest,
+            finished_states=[ComputationState.Completed],
+            polling_interval=180,
+            timeout=None,
+            timeout_message="Timed out",
+        )
+        self.assertEqual(completed, response)
+        self.assertEqual(
+            [2.5, 4.5, 8.5]
+            + [2.5, 4.5, 8.5, 16.5, 32.5, 64.5, 128.5, 180.5, 180.5],
+            [c.args[0] for c in mock_sleep.call_args_list],
+        )
+
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_poll_until_backoff_polling_interval(
+        self, mock_sleep: MagicMock, mock_uniform: MagicMock
+    ):
+        """Tests poll interval is capped by a short polling_interval"""
+        mock_uniform.return_value = 0
+        running = self._computation(ComputationState.Running)
+        completed = self._computation(ComputationState.Completed)
+        _poll_until(
+            get_latest=MagicMock(side_effect=[running] * 4 + [completed]),
+            finished_states=[ComputationState.Completed],
+            polling_interval=5,
+            timeout=None,
+            timeout_message="Timed out",
+        )
+        mock_sleep.assert_has_calls([call(2), call(4), call(5), call(5)])
+
+    @patch("aind_codeocean_pipeline_monitor.job.random.uniform")
+    @patch("aind_codeocean_pipeline_monitor.job.time")
+    @patch("aind_codeocean_pipeline_monitor.job.sleep", return_value=None)
+    def test_poll_until_timeout(
+        self, mock_sleep: MagicMock, mock_time, mock_uniform: MagicMock
+    ):
+        """Tests TimeoutError is raised once timeout is exceeded"""
+        mock_uniform.return_value = 0
+        mock_time.side_effect = [0, 10, 20]
+        running = Computation(
+            id="c123",
+            created=0,
+            name="c_name",
+            state=ComputationState.Running,
+            run_time=1,
+        )
+        with self.assertRaises(TimeoutError) as e:
+            _poll_until(
+                get_latest=MagicMock(return_value=running),
+                finished_states=[ComputationState.Completed],
+                polling_interval=5,
+                timeout=15,
+                timeout_message="Timed out",
+            )
+        self.assertEqual(("Timed out",), e.exception.args)
+        mock_sleep.assert_called_once_with(2)
+
+    def test_poll_until_invalid_settings(self):
+        """Tests ValueError is raised for invalid interval or timeout"""
+        get_latest = MagicMock()
+        with self.assertRaises(ValueError):
+            _poll_until(
+                get_latest=get_latest,
+                finished_states=[ComputationState.Completed],
+                polling_interval=1,
+                timeout=None,
+                timeout_message="Timed out",
+            )
+        with self.assertRaises(ValueError):
+            _poll_until(
+                get_latest=get_latest,
+                finished_states=[ComputationState.Completed],
+                polling_interval=10,
+                timeout=5,
+                timeout_message="Timed out",
+            )
+        get_latest.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
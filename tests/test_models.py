@@ -1,6 +1,8 @@
 """Tests for models module"""
 
 import json
+import subprocess
+import sys
 import unittest
 
 from codeocean.computation import RunParams
@@ -129,5 +131,30 @@ class TestsPipelineMonitorSettings(unittest.TestCase):
         self.assertIn("data_asset_ready_timeout", errors[1]["msg"])
 
 
+class TestImports(unittest.TestCase):
+    """Tests models can be used without the job dependencies"""
+
+    def test_models_do_not_import_job_dependencies(self):
+        """Importing the models module should not import the job module or
+        the packages only installed with the 'full' extra."""
+        code = (
+            "import sys\n"
+            "import aind_codeocean_pipeline_monitor.models\n"
+            "heavy = [\n"
+            "    'aind_codeocean_pipeline_monitor.job',\n"
+            "    'aind_alert_utils',\n"
+            "    'aind_data_schema_models',\n"
+            "]\n"
+            "print([m for m in heavy if m in sys.modules])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual("[]", result.stdout.strip())
+
+
 if __name__ == "__main__":
     unittest.main()